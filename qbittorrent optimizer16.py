@@ -1,193 +1,305 @@
+import os
 import sys
-import subprocess
-import threading
+import select
 import time
 import logging
 import re
-import psutil
-
-# -------------------- Helper Functions --------------------
-def check_pip_update():
-    """Check if a newer version of pip is available and prompt the user to update."""
-    try:
-        import pip
-        from packaging import version
-
-        current_version = pip.__version__
-
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "--upgrade", "pip", "--dry-run"],
-            capture_output=True, text=True
-        )
-
-        match = re.search(r'pip-(\d+\.\d+(?:\.\d+)?)', result.stdout)
-        if match:
-            latest_version_str = match.group(1)
-            if version.parse(latest_version_str) > version.parse(current_version):
-                update = input(f"A newer version of pip is available ({latest_version_str}). Update now? (y/n): ").strip().lower()
-                if update == "y":
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
-    except Exception as e:
-        print(f"Could not check pip version: {e}")
-
-
-# -------------------- Module Check --------------------
-def check_and_install_modules():
-    required_modules = {
-        'qbittorrentapi': 'qbittorrent-api',
-        'psutil': 'psutil'
-    }
-
-    check_pip_update()
-
-    for module, pip_name in required_modules.items():
-        try:
-            __import__(module)
-            print(f"Module '{module}' is already installed.")
-        except ImportError:
-            print(f"Module '{module}' is missing.")
-            install = input(f"Do you want to install '{module}' now? (y/n): ").strip().lower()
-            if install == 'y':
-                subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
-            else:
-                print(f"'{module}' is required. Exiting script.")
-                sys.exit(1)
-
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 # -------------------- Imports --------------------
-check_and_install_modules()
-import qbittorrentapi
+try:
+    import qbittorrentapi
+    import psutil
+except ImportError as e:
+    sys.exit(f"Missing dependency: {e.name}. Run: pip install qbittorrent-api psutil")
 
 # -------------------- Configuration --------------------
 QB_URL = 'http://127.0.0.1:8080'
 QB_USERNAME = 'admin'
 QB_PASSWORD = 'adminadmin'
-POLL_INTERVAL = 2       # Seconds between checks
+POLL_INTERVAL = 2       # Seconds between checks while things are changing
+MAX_POLL_INTERVAL = 60  # Seconds between checks once nothing has changed for a while
 STALL_WAIT_TIME = 300   # Seconds before restarting a stalled torrent
 START_WAIT_TIME = 120   # Seconds (2-minute wait before exiting if no activity)
+API_WORKERS = 8         # Concurrent Web API requests per tick
+
+ACTIVE_STATES = frozenset({"downloading", "stalledDL", "metaDL", "checkingDL", "allocating"})
+SEEDING_STATES = frozenset({"uploading", "stalledUP", "queuedUP", "pausedUP"})
 
 # -------------------- Regex Pattern --------------------
-TV_SERIES_NAME_PATTERN = re.compile(
-    r"""(?ix)                                 
-    (?:                                         
-        S(?P<season>\d{1,2})E(?P<episode>\d{1,3})          
-        |                                       
-        (?P<alt_season>\d{1,2})[xX](?P<alt_episode>\d{1,3})   
-        |                                       
-        Season\s*(?P<long_season>\d{1,2})      
-        (?:\s*Episode|\s*Ep\.?)\s*(?P<long_episode>\d{1,3})
-        |                                       
-        (?:Ep(?:isode)?\.?\s*)(?P<anime_episode>\d{1,3})   
-        |                                       
-        [\s\-\_\.]\(?(?P<solo_episode>\d{1,3})(?!\d)
-    )
-    """,
-    re.VERBOSE | re.IGNORECASE
+# No VERBOSE mode or lookarounds so the same pattern compiles under RE2
+TV_SERIES_NAME_REGEX = (
+    r"(?i)(?:"
+    r"S(?P<season>\d{1,2})E(?P<episode>\d{1,3})"
+    r"|(?P<alt_season>\d{1,2})[xX](?P<alt_episode>\d{1,3})"
+    r"|Season\s*(?P<long_season>\d{1,2})(?:\s*Episode|\s*Ep\.?)\s*(?P<long_episode>\d{1,3})"
+    r"|(?:Ep(?:isode)?\.?\s*)(?P<anime_episode>\d{1,3})"
+    r"|[\s\-\_\.]\(?(?P<solo_episode>\d{1,3})(?:\D|$)"
+    r")"
 )
 
+try:
+    import re2  # Optional: pip install google-re2 for linear-time matching
+    TV_SERIES_NAME_PATTERN = re2.compile(TV_SERIES_NAME_REGEX)
+except ImportError:
+    TV_SERIES_NAME_PATTERN = re.compile(TV_SERIES_NAME_REGEX)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
-last_prioritized = {}
+torrent_states = {}  # torrent hash -> TrackedTorrent
+files_cache = {}  # torrent hash -> ((state, downloaded, progress), files)
+episode_cache = {}  # torrent hash -> (file names, [(season, episode, position)])
+episode_cursor = {}  # torrent hash -> position of the next unfinished episode in episode_cache
+worker_clients = threading.local()  # per-thread qbittorrentapi.Client used by the worker pool
 
 # -------------------- Helpers --------------------
+class TrackedTorrent:
+    """Per-torrent bookkeeping for the main loop."""
+    __slots__ = ('last_index', 'stalled_since')
+
+    def __init__(self):
+        self.last_index = None      # File index of the currently prioritized episode
+        self.stalled_since = None   # time.monotonic() when the torrent was first seen stalled
+
+
 def wait_for_qbittorrent():
+    """Wait until the qBittorrent Web UI accepts connections."""
     logging.info("Waiting for qBittorrent to open...")
+    # QB_URL may also be a bare 'host:port', which qbittorrentapi accepts but urlsplit can't parse
+    url = urlsplit(QB_URL if "://" in QB_URL else f"http://{QB_URL}")
+    address = (url.hostname, url.port or 8080)
     while True:
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] and "qbittorrent" in proc.info['name'].lower():
+        with socket.socket() as sock:
+            sock.settimeout(0.5)
+            if sock.connect_ex(address) == 0:
                 logging.info("qBittorrent is running!")
                 return
         time.sleep(2)
 
 
+def read_comm(pid):
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def find_qbittorrent_pids():
+    """Return the PIDs of running qBittorrent processes."""
+    # On Linux one small /proc/<pid>/comm read per process beats psutil's per-process setup
+    if os.path.isdir("/proc"):
+        return [int(entry.name) for entry in os.scandir("/proc")
+                if entry.name.isdigit() and "qbittorrent" in read_comm(entry.name).lower()]
+    return [proc.pid for proc in psutil.process_iter(['name'])
+            if proc.info['name'] and "qbittorrent" in proc.info['name'].lower()]
+
+
+def open_pidfd(pid):
+    """Return a pidfd for the process (Linux 5.3+), or None where that isn't available."""
+    if pid is None or not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def wait_for_exit(pidfd, timeout):
+    """Sleep for timeout seconds, returning True early if the pidfd's process exits."""
+    if pidfd is None:
+        time.sleep(timeout)
+        return False
+    watch = select.poll()
+    watch.register(pidfd, select.POLLIN)
+    return bool(watch.poll(timeout * 1000))
+
+
 def connect_to_qb():
-    qb = qbittorrentapi.Client(host=QB_URL, username=QB_USERNAME, password=QB_PASSWORD)
+    # Every call goes through one pooled keep-alive session instead of reconnecting per request
+    qb = qbittorrentapi.Client(
+        host=QB_URL,
+        username=QB_USERNAME,
+        password=QB_PASSWORD,
+        EXTRA_HEADERS={'Connection': 'keep-alive'},
+        HTTPADAPTER_ARGS={'pool_connections': 1, 'pool_maxsize': API_WORKERS + 1},
+    )
     try:
         qb.auth_log_in()
     except qbittorrentapi.LoginFailed as e:
-        logging.error(f"Login failed: {e}")
+        logging.error("Login failed: %s", e)
         exit(1)
     return qb
 
 
-def get_sorted_episodes(files):
-    episodes = []
-    for file in files:
-        match = TV_SERIES_NAME_PATTERN.search(file['name'])
-        if match:
-            season = (
-                match.group('season') or
-                match.group('alt_season') or
-                match.group('long_season')
-            )
-            episode = (
-                match.group('episode') or
-                match.group('alt_episode') or
-                match.group('long_episode') or
-                match.group('anime_episode') or
-                match.group('solo_episode')
-            )
-            if episode:
-                try:
-                    season_num = int(season) if season else 1
-                    episode_num = int(episode)
-                    episodes.append((season_num, episode_num, file['index'], file['progress'], file['name']))
-                except ValueError:
-                    continue
-    episodes.sort(key=lambda x: (x[0], x[1]))
-    return episodes
+@lru_cache(maxsize=8192)
+def parse_episode(name):
+    """Return (season, episode) parsed from a file name, or None if it isn't an episode."""
+    # Every alternative in the pattern needs a digit, so skip the regex for names without one
+    if not any(digit in name for digit in "0123456789"):
+        return None
+    match = TV_SERIES_NAME_PATTERN.search(name)
+    if not match:
+        return None
+    season = (
+        match.group('season') or
+        match.group('alt_season') or
+        match.group('long_season')
+    )
+    episode = (
+        match.group('episode') or
+        match.group('alt_episode') or
+        match.group('long_episode') or
+        match.group('anime_episode') or
+        match.group('solo_episode')
+    )
+    if not episode:
+        return None
+    try:
+        return (int(season) if season else 1, int(episode))
+    except ValueError:
+        return None
 
 
-def update_file_priority(qb, torrent_hash, file_index, desired_priority):
-    qb.torrents_file_priority(torrent_hash=torrent_hash, file_ids=[file_index], priority=desired_priority)
+def get_worker_client():
+    """Return this worker thread's own API client."""
+    # qbittorrentapi resets its session on transport errors, so workers must not share one client
+    qb = getattr(worker_clients, 'qb', None)
+    if qb is None:
+        qb = worker_clients.qb = connect_to_qb()
+    return qb
+
+
+def get_sorted_episodes(torrent_hash, files):
+    """Return the torrent's (season, episode, position) list in episode order."""
+    # File names never change, so the regex only runs when a torrent's name list is new
+    names = tuple(file['name'] for file in files)
+    cached = episode_cache.get(torrent_hash)
+    if cached is None or cached[0] != names:
+        parsed = []
+        for position, name in enumerate(names):
+            season_episode = parse_episode(name)
+            if season_episode:
+                parsed.append((*season_episode, position))
+        parsed.sort()
+        cached = (names, parsed)
+        episode_cache[torrent_hash] = cached
+        episode_cursor.pop(torrent_hash, None)
+    return cached[1]
+
+
+def get_next_episode(torrent_hash, files):
+    """Return the first unfinished episode's file, advancing the torrent's cursor past finished ones."""
+    episodes = get_sorted_episodes(torrent_hash, files)
+    cursor = episode_cursor.get(torrent_hash, 0)
+    while cursor < len(episodes) and files[episodes[cursor][2]]['progress'] >= 1.0:
+        cursor += 1
+    episode_cursor[torrent_hash] = cursor
+    if cursor < len(episodes):
+        return files[episodes[cursor][2]]
+    return None
+
+
+def get_files(qb, torrent):
+    """Return the torrent's file list, only re-fetching it when the torrent has changed."""
+    # File progress only moves once a piece passes its hash check, which can lag the downloaded byte count
+    key = (torrent.state, torrent.downloaded, torrent.progress)
+    cached = files_cache.get(torrent.hash)
+    if cached and cached[0] == key:
+        return cached[1]
+    files = qb.torrents_files(torrent_hash=torrent.hash)
+    files_cache[torrent.hash] = (key, files)
+    return files
+
+
+def update_file_priorities(qb, torrent_hash, ids_by_priority):
+    """Set file priorities with one API call per distinct priority."""
+    changed = False
+    for priority, file_ids in ids_by_priority.items():
+        if file_ids:
+            qb.torrents_file_priority(torrent_hash=torrent_hash, file_ids=file_ids, priority=priority)
+            changed = True
+    if changed:
+        files_cache.pop(torrent_hash, None)
+    return changed
 
 
 def mark_and_remove_seeding(qb, torrents):
     logging.info("All torrents are seeding. Marking files as 'Do Not Download' and removing torrents (files kept).")
+    marked = []
     for torrent in torrents:
         try:
-            files = qb.torrents_files(torrent.hash)
-            for f in files:
-                qb.torrents_file_priority(torrent.hash, [f.id], [0])
-            qb.torrents_delete(delete_files=False, torrent_hashes=torrent.hash)
-            logging.info(f"Closed torrent {torrent.name} (files kept).")
+            files = get_files(qb, torrent)
+            update_file_priorities(qb, torrent.hash, {0: [f['index'] for f in files]})
+            marked.append(torrent)
         except Exception as e:
-            logging.error(f"Error handling torrent {torrent.name}: {e}")
+            logging.error("Error handling torrent %s: %s", torrent.name, e)
 
+    if not marked:
+        return
+    try:
+        qb.torrents_delete(delete_files=False, torrent_hashes=[t.hash for t in marked])
+        for torrent in marked:
+            logging.info("Closed torrent %s (files kept).", torrent.name)
+    except Exception as e:
+        logging.error("Error removing seeding torrents: %s", e)
 
-def any_torrents_active(qb):
-    active_states = {"downloading", "stalledDL", "metaDL", "checkingDL", "allocating"}
-    seeding_states = {"uploading", "stalledUP", "queuedUP", "pausedUP"}
 
-    torrents = qb.torrents_info()
+def any_torrents_active(qb, torrents=None):
+    """Return True while any torrent is still downloading; pass torrents to reuse an existing listing."""
+    if torrents is None:
+        torrents = qb.torrents_info()
     if not torrents:
         return False
 
-    if all(t.state in seeding_states for t in torrents):
+    if all(t.state in SEEDING_STATES for t in torrents):
         mark_and_remove_seeding(qb, torrents)
         return False
 
-    for torrent in torrents:
-        if torrent.state in active_states:
-            return True
-        files = qb.torrents_files(torrent.hash)
-        if files and any(file['progress'] < 1.0 for file in files):
-            return True
-    return False
+    # The summary progress already reflects the files, so no per-torrent file fetch is needed
+    return any(t.state in ACTIVE_STATES or t.progress < 1.0 for t in torrents)
+
+
+def sync_torrents(qb, sync_state):
+    """Merge the latest sync/maindata delta into sync_state and return the hashes that changed."""
+    data = qb.sync_maindata(rid=sync_state['rid'])
+    torrents = sync_state['torrents']
+    if data.get('full_update'):
+        torrents.clear()
+
+    for torrent_hash in data.get('torrents_removed', []):
+        torrents.pop(torrent_hash, None)
+
+    changed = set()
+    for torrent_hash, delta in data.get('torrents', {}).items():
+        torrent = torrents.setdefault(torrent_hash, delta)
+        if torrent is not delta:
+            torrent.update(delta)
+        torrent['hash'] = torrent_hash
+        changed.add(torrent_hash)
+
+    sync_state['rid'] = data['rid']
+    return changed
 
 
-def remove_completed_torrent(qb, torrent):
-    logging.info(f"Removing completed torrent (keeping files): {torrent.name}")
-    qb.torrents_delete(delete_files=False, torrent_hashes=torrent.hash)
+def remove_completed_torrents(qb, torrents):
+    """Remove finished torrents (keeping their files) with a single API call."""
+    for torrent in torrents:
+        logging.info("Removing completed torrent (keeping files): %s", torrent.name)
+    qb.torrents_delete(delete_files=False, torrent_hashes=[t.hash for t in torrents])
 
 
 def force_restart_torrent(qb, torrent):
     try:
-        logging.info(f"Forcing restart of stalled torrent: {torrent.name}")
+        logging.info("Forcing restart of stalled torrent: %s", torrent.name)
         qb.torrents_pause(torrent.hash)
         time.sleep(2)
         qb.torrents_resume(torrent.hash)
     except Exception as e:
-        logging.error(f"Failed to restart torrent {torrent.name}: {e}")
+        logging.error("Failed to restart torrent %s: %s", torrent.name, e)
 
 
 # -------------------- Main Logic --------------------
@@ -200,15 +312,19 @@ def manage_priorities():
     qb = connect_to_qb()
 
     # -------------------- 2-minute countdown for no active torrents --------------------
-    start_time = time.time()
-    logging.info(f"No active torrents detected. The program will exit in {START_WAIT_TIME//60}:{START_WAIT_TIME%60:02d} minutes if no activity occurs.")
+    # Wake immediately if qBittorrent itself closes instead of finding out on the next API call
+    qb_pidfd = open_pidfd(next(iter(find_qbittorrent_pids()), None))
+    start_time = time.monotonic()
+    shown_remaining = None
+    logging.info("No active torrents detected. The program will exit in %d:%02d minutes if no activity occurs.",
+                 START_WAIT_TIME // 60, START_WAIT_TIME % 60)
 
     while True:
         if any_torrents_active(qb):
             logging.info("Torrent activity detected. Proceeding...")
             break
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         remaining = int(START_WAIT_TIME - elapsed)
         if remaining <= 0:
             logging.info("No active torrents during 2-minute wait. Closing qBittorrent and exiting.")
@@ -218,79 +334,169 @@ def manage_priorities():
                 qb.app_shutdown()
                 logging.info("qBittorrent shutdown command sent successfully.")
             except Exception as e:
-                logging.error(f"Failed to shutdown qBittorrent via API: {e}")
+                logging.error("Failed to shutdown qBittorrent via API: %s", e)
 
             # Forcefully terminate process if still running
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] and "qbittorrent" in proc.info['name'].lower():
-                    try:
+            for pid in find_qbittorrent_pids():
+                try:
+                    proc = psutil.Process(pid)
+                    name = proc.name()
+                    # The PID may have been reused since the scan, so confirm it is still qBittorrent
+                    if "qbittorrent" in name.lower():
                         proc.terminate()
-                        logging.info(f"Terminated process: {proc.info['name']}")
-                    except Exception as e:
-                        logging.error(f"Failed to terminate process {proc.info['name']}: {e}")
+                        logging.info("Terminated process: %s", name)
+                except Exception as e:
+                    logging.error("Failed to terminate process %s: %s", pid, e)
+
+            return
 
+        # Only redraw when the displayed time actually changes
+        if remaining != shown_remaining:
+            mins, secs = divmod(remaining, 60)
+            sys.stdout.write(f"⏳ Exiting in {mins:02}:{secs:02} if no activity occurs...\r")
+            sys.stdout.flush()
+            shown_remaining = remaining
+        if wait_for_exit(qb_pidfd, 1):
+            logging.info("qBittorrent was closed. Exiting.")
             return
 
-        mins, secs = divmod(remaining, 60)
-        print(f"⏳ Exiting in {mins:02}:{secs:02} if no activity occurs...", end="\r")
-        time.sleep(1)
+    if qb_pidfd is not None:
+        os.close(qb_pidfd)
 
     # -------------------- Main torrent management loop --------------------
-    global last_prioritized
     removed_torrents = set()
-    stalled_since = {}
+    processed_files = {}
+    sync_state = {'rid': 0, 'torrents': {}}
+    executor = ThreadPoolExecutor(max_workers=API_WORKERS)
+    interval = POLL_INTERVAL
 
     while True:
-        torrents = qb.torrents_info()
-
-        for torrent in torrents:
-            torrent_hash = torrent.hash
+        tick_start = time.monotonic()
+        dirty = False  # Set when this tick acts on a torrent or sees a download change
+
+        # Only torrents that changed since the last tick need work, plus stalled ones whose timer is running
+        changed = sync_torrents(qb, sync_state)
+        torrents = sync_state['torrents']
+
+        pending = []
+        to_remove = []
+        stalled = {h for h, state in torrent_states.items() if state.stalled_since is not None}
+        for torrent_hash in changed | stalled:
+            torrent = torrents.get(torrent_hash)
+            if torrent is None:
+                torrent_states.pop(torrent_hash, None)
+                dirty = True
+                continue
+            # Keep polling quickly while downloads are moving so the next episode is promoted promptly
+            if torrent_hash in changed and (torrent.state in ACTIVE_STATES or torrent.progress < 1.0):
+                dirty = True
             if torrent.state == "metaDL":
-                logging.info(f"Skipping {torrent.name} (metadata still downloading)")
+                logging.info("Skipping %s (metadata still downloading)", torrent.name)
                 continue
 
-            files = qb.torrents_files(torrent_hash=torrent_hash)
-            sorted_episodes = get_sorted_episodes(files)
+            state = torrent_states.get(torrent_hash)
+            if state is None:
+                state = torrent_states[torrent_hash] = TrackedTorrent()
 
-            for file in files:
-                if file['progress'] >= 1.0 and file['priority'] != 0:
-                    logging.info(f"Marking completed file as 'Do Not Download': {file['name']}")
-                    update_file_priority(qb, torrent_hash, file['index'], 0)
-
-            if files and all(file['progress'] >= 1.0 for file in files):
+            if torrent.state == "stalledDL":
+                if state.stalled_since is None:
+                    state.stalled_since = time.monotonic()
+                    logging.info("%s is stalled. Monitoring...", torrent.name)
+                    dirty = True
+                elif time.monotonic() - state.stalled_since >= STALL_WAIT_TIME:
+                    force_restart_torrent(qb, torrent)
+                    state.stalled_since = time.monotonic()
+                    dirty = True
+            elif state.stalled_since is not None:
+                state.stalled_since = None
+                dirty = True
+
+            # A finished torrent that isn't a series has no episodes to order, so its file list isn't needed
+            if torrent.progress >= 1.0 and not parse_episode(torrent.name):
                 if torrent_hash not in removed_torrents:
-                    logging.info(f"All files completed. Removing torrent: {torrent.name} (keeping files)")
-                    remove_completed_torrent(qb, torrent)
+                    logging.info("All files completed. Removing torrent: %s (keeping files)", torrent.name)
+                    to_remove.append(torrent)
                     removed_torrents.add(torrent_hash)
+                    dirty = True
                 continue
 
-            if sorted_episodes:
-                next_ep = next((ep for ep in sorted_episodes if ep[3] < 1.0), None)
-                if next_ep:
-                    next_index = next_ep[2]
-                    last_index = last_prioritized.get(torrent_hash)
-                    if last_index != next_index:
-                        logging.info(f"Promoting episode: {next_ep[4]}")
-                        last_prioritized[torrent_hash] = next_index
-                        update_file_priority(qb, torrent_hash, next_index, 7)
-                        if last_index is not None:
-                            update_file_priority(qb, torrent_hash, last_index, 1)
+            pending.append(torrent)
 
-            if torrent.state == "stalledDL":
-                if torrent_hash not in stalled_since:
-                    stalled_since[torrent_hash] = time.time()
-                    logging.info(f"{torrent.name} is stalled. Monitoring...")
-                elif time.time() - stalled_since[torrent_hash] >= STALL_WAIT_TIME:
-                    force_restart_torrent(qb, torrent)
-                    stalled_since[torrent_hash] = time.time()
-            else:
-                stalled_since.pop(torrent_hash, None)
+        # File lists and priority updates are independent round trips, so run them concurrently
+        file_lists = executor.map(lambda torrent: get_files(get_worker_client(), torrent), pending)
+        updates = []
+        for torrent, files in zip(pending, file_lists):
+            torrent_hash = torrent.hash
+
+            # Nothing changed since this file list was last handled, so neither did the outcome
+            if files is processed_files.get(torrent_hash):
+                continue
+            processed_files[torrent_hash] = files
+
+            # One pass finds both the completed set and the completed files that still need zeroing
+            to_zero = []
+            completed = set()
+            for file in files:
+                if file['progress'] >= 1.0:
+                    index = file['index']
+                    completed.add(index)
+                    if file['priority'] != 0:
+                        logging.info("Marking completed file as 'Do Not Download': %s", file['name'])
+                        to_zero.append(index)
+            ids_by_priority = {0: to_zero, 7: []}
+
+            if files and len(completed) == len(files):
+                update_file_priorities(qb, torrent_hash, ids_by_priority)
+                if torrent_hash not in removed_torrents:
+                    logging.info("All files completed. Removing torrent: %s (keeping files)", torrent.name)
+                    to_remove.append(torrent)
+                    removed_torrents.add(torrent_hash)
+                    dirty = True
+                continue
 
-        if not any_torrents_active(qb):
+            # Episode order never changes, so an unfinished prioritized episode is still the next one
+            state = torrent_states[torrent_hash]
+            if state.last_index is None or state.last_index in completed:
+                next_file = get_next_episode(torrent_hash, files)
+                if next_file:
+                    logging.info("Promoting episode: %s", next_file['name'])
+                    state.last_index = next_file['index']
+                    ids_by_priority[7].append(next_file['index'])
+
+            updates.append(executor.submit(
+                lambda h, ids: update_file_priorities(get_worker_client(), h, ids), torrent_hash, ids_by_priority))
+
+        for update in updates:
+            if update.result():
+                dirty = True
+
+        # Everything that finished this tick goes out in one delete request
+        if to_remove:
+            remove_completed_torrents(qb, to_remove)
+
+        # Drop bookkeeping for torrents qBittorrent no longer has so long runs don't accumulate it
+        live = torrents.keys()
+        removed_torrents &= live
+        for tracked in (torrent_states, processed_files, files_cache, episode_cache, episode_cursor):
+            for torrent_hash in tracked.keys() - live:
+                del tracked[torrent_hash]
+
+        # Torrents deleted this session stay in the sync listing until qBittorrent reports them removed
+        remaining = [t for h, t in torrents.items() if h not in removed_torrents]
+        if not any_torrents_active(qb, remaining):
             logging.info("All downloads complete or all torrents seeding. Exiting.")
             break
 
-        time.sleep(POLL_INTERVAL)
+        # Poll quickly while acting on torrents and back off while nothing needs doing
+        if dirty:
+            interval = POLL_INTERVAL
+        else:
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+        # Keep a steady cadence: the time spent on API calls counts toward the interval
+        time.sleep(max(0.0, interval - (time.monotonic() - tick_start)))
+
+    executor.shutdown()
 
 
 # -------------------- Entry Point --------------------